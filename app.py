@@ -5,29 +5,62 @@ Demonstrates: modules, functions, control flow, string formatting, dictionaries,
 # - Functions with docstrings (Lec 5), control flow (Lec 2), dict/list ops (Lec 3).
 # - Small lambda used to prettify labels (Lec 6).
 
-from flask import Flask, render_template, request, redirect, url_for
+import os
+import threading
+from functools import lru_cache
+from operator import itemgetter
+
+from flask import Flask, render_template, request, redirect, stream_template, url_for
 
 from data_loader import load_reviews_csv
-from metrics import monthly_sentiment_trend, monthly_card_metrics
-from sentiment_engine import analyze_review, label_to_color
+from metrics import compute_month_stats
+from sentiment_engine import analyze_corpus_review, analyze_review, label_to_color
 
 app = Flask(__name__)
+# debug (reloader, debugger, template re-stat) only when asked for explicitly
+DEBUG = os.environ.get("CARESENSE_DEBUG") == "1"
+app.config["TEMPLATES_AUTO_RELOAD"] = DEBUG
+app.jinja_env.auto_reload = DEBUG
 
 # ---- In-memory "state" (simple for Fundamentals; no DB) ---------------------
 REVIEWS = []  # list[dict]
+REVIEWS_BY_SCORE = []  # same rows, highest sentiment score first
+_INIT_LOCK = threading.Lock()
+
+
+def _attach_label(r: dict) -> None:
+    """Attach sentiment label/score if the CSV row has none."""
+    if not r.get("Label"):
+        r["Label"], r["Score"] = analyze_corpus_review(r["Review Text"])
 
 
 def init_data():
     """Load a small demo dataset once at startup.
     Uses CSV and plain Python lists/dicts to emphasize fundamentals.
+    Parsed rows are cached on disk by the loader, so restarts skip re-parsing.
     """
-    global REVIEWS
-    if not REVIEWS:
-        REVIEWS = load_reviews_csv("data/sample_reviews_300.csv")
-        # Attach sentiment labels if missing
-        for r in REVIEWS:
-            if not r.get("Label"):
-                r["Label"], r["Score"] = analyze_review(r.get("Review Text", ""))
+    global REVIEWS, REVIEWS_BY_SCORE
+    if REVIEWS:
+        return
+    with _INIT_LOCK:  # concurrent first requests load only once
+        if not REVIEWS:
+            rows = load_reviews_csv("data/sample_reviews_300.csv", annotate=_attach_label)
+            # CSV-labeled rows carry no score; default it so itemgetter can sort
+            for r in rows:
+                r.setdefault("Score", 0)
+            # Sort by sentiment score – once, not per request
+            REVIEWS_BY_SCORE = sorted(rows, key=itemgetter("Score"), reverse=True)
+            REVIEWS = rows
+            dashboard_snapshot.cache_clear()
+
+
+# keys are raw query values, so keep only the most recent filter pairs;
+# REVIEWS is static once loaded (init_data clears this on load)
+@lru_cache(maxsize=64)
+def dashboard_snapshot(year: str, state: str) -> dict:
+    """Card metrics + trend for a filter pair, computed once and memoized."""
+    metrics, trend = compute_month_stats(REVIEWS, year_filter=year, state_filter=state)
+    return {"metrics": metrics, "trend": trend}
 
 
 @app.route("/")
@@ -42,23 +75,22 @@ def dashboard():
     review_stars = request.args.get("review_stars", "All")
     keyword = request.args.get("keyword", "").lower()
 
-    metrics = monthly_card_metrics(REVIEWS, year_filter=year, state_filter=state)
-    trend = monthly_sentiment_trend(REVIEWS, year)
-
-    filtered_reviews = []
-    for r in REVIEWS:
-        if (review_year == "All" or r["YearMonth"].startswith(review_year)) \
-        and (review_state in ("All States", "All") or r["State"] == review_state) \
-        and (review_stars == "All" or str(r["Review Rating"]) == review_stars) and(not keyword or keyword in r["Review Text"].lower()):
-                
-            
-                filtered_reviews.append({
-                **r,
-                "LabelColor": label_to_color(r.get("Label", "neutral")),
-                "Snippet": (r.get("Review Text", "")[:140] + "…") 
-                           if len(r.get("Review Text", "")) > 140 
-                           else r.get("Review Text", ""),
-            })
+    snap = dashboard_snapshot(year, state)
+    metrics, trend = snap["metrics"], snap["trend"]
+
+    # evaluate the "All" checks once, not per row
+    any_year = review_year == "All"
+    any_state = review_state in ("All States", "All")
+    any_stars = review_stars == "All"
+    matching = (
+        r for r in REVIEWS
+        if (any_year or r["YearMonth"].startswith(review_year))
+        and (any_state or r["State"] == review_state)
+        and (any_stars or str(r["Review Rating"]) == review_stars)
+        and (not keyword or keyword in r["Review Text"].lower())
+    )
+    # enriched lazily while the template loops, no intermediate list
+    filtered_reviews = _iter_labeled(matching)
 
     return render_template(
         "index.html",
@@ -73,20 +105,18 @@ def dashboard():
     )
 
 
+def _iter_labeled(rows):
+    """Yield display-ready copies of rows one at a time (for streaming)."""
+    for r in rows:
+        # Snippet is precomputed by the loader; only the color is added here
+        yield {**r, "LabelColor": label_to_color(r.get("Label", "neutral"))}
+
+
 @app.route("/")
 def reviews():
     init_data()
-    labeled = [
-        {
-            **r,
-            "LabelColor": label_to_color(r.get("Label", "neutral")),
-            "Snippet": (r.get("Review Text", "")[:140] + "…") if len(r.get("Review Text", "")) > 140 else r.get("Review Text", ""),
-        }
-        for r in REVIEWS
-    ]
-    # Sort by sentiment score (lambda demo) – highest first
-    labeled.sort(key=lambda x: x.get("Score", 0), reverse=True)
-    return render_template("index.html", reviews=labeled)
+    # stream the page so rows are rendered while they are being prepared
+    return stream_template("index.html", reviews=_iter_labeled(REVIEWS_BY_SCORE))
 
 
 @app.route("/analyze", methods=["POST"])
@@ -101,6 +131,6 @@ def analyze_text():
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    app.run(debug=DEBUG, use_reloader=DEBUG, threaded=True)
 
 
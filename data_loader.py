@@ -1,37 +1,153 @@
 """Simple CSV loader using the stdlib (no pandas), to practice file I/O.
 Columns expected: Author, Review Text, Review Rating, Date, State
+Each row also gets a derived YearMonth and a display Snippet.
 """
 import csv
-from datetime import datetime
+import os
+import pickle
+import re
+import sys
+from calendar import monthrange
+from functools import lru_cache
+from typing import Callable, Optional
 
+# bump when the row layout changes so stale .pkl caches are ignored
+_CACHE_VERSION = 3
+SNIPPET_LEN = 140
 
+# expected columns and the value used when the CSV lacks the column
+_COLUMNS = {
+    "Author": "Anonymous",
+    "Review Text": "",
+    "Review Rating": "0",
+    "Date": "",
+    "State": "Unknown",
+    "Label": "",
+}
+
+
+# Y-M-D / Y/M/D and D-M-Y / D/M/Y / M/D/Y, same separator on both sides;
+# like strptime's %d, a day may be a single digit with one leading space
+_DAY = r"( [1-9]|\d{1,2})"
+_YMD_RE = re.compile(r"(\d{4})([-/])(\d{1,2})\2" + _DAY, re.ASCII)
+_DMY_RE = re.compile(_DAY + r"([-/])" + _DAY + r"\2(\d{4})", re.ASCII)
+
+
+def _valid(y: int, m: int, d: int) -> bool:
+    return y >= 1 and 1 <= m <= 12 and 1 <= d <= monthrange(y, m)[1]
+
+
+@lru_cache(maxsize=None)  # few distinct dates per dataset
 def parse_date(s: str) -> str:
-    """Normalize dates to YYYY-MM format for grouping. Accepts many forms."""
-    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%Y/%m/%d", "%d-%m-%Y"):
-        try:
-            return datetime.strptime(s, fmt).strftime("%Y-%m")
-        except ValueError:
-            pass
+    """Normalize dates to YYYY-MM format for grouping. Accepts many forms:
+    YYYY-MM-DD, DD/MM/YYYY, MM/DD/YYYY, YYYY/MM/DD, DD-MM-YYYY (tried in that order).
+    """
+    m = _YMD_RE.fullmatch(s)
+    if m:
+        y, mo, d = int(m[1]), int(m[3]), int(m[4])
+        if _valid(y, mo, d):
+            return f"{y:04d}-{mo:02d}"
+        return "Unknown"
+    m = _DMY_RE.fullmatch(s)
+    if m:
+        a, b, y = int(m[1]), int(m[3]), int(m[4])
+        # a field with a leading space can only be the day
+        if m[3][0] != " " and _valid(y, b, a):  # day first
+            return f"{y:04d}-{b:02d}"
+        if m[2] == "/" and m[1][0] != " " and _valid(y, a, b):  # US month first
+            return f"{y:04d}-{a:02d}"
     return "Unknown"
 
 
-def load_reviews_csv(path: str) -> list[dict]:
+def _cache_key(path: str) -> tuple:
+    # a changed file (mtime/size) or row layout invalidates the cache
+    return (
+        _CACHE_VERSION,
+        os.path.abspath(path),
+        os.path.getmtime(path),
+        os.path.getsize(path),
+    )
+
+
+def _intern_labels(rows: list[dict]) -> list[dict]:
+    """Intern the few distinct State/Label strings so comparisons and dict
+    lookups on them hit the identity fast path (unpickled strings are not interned).
+    """
+    intern = sys.intern
+    for r in rows:
+        for field in ("State", "Label"):
+            v = r.get(field)
+            if isinstance(v, str):
+                r[field] = intern(v)
+    return rows
+
+
+def load_reviews_csv(path: str, annotate: Optional[Callable[[dict], None]] = None) -> list[dict]:
+    """Parse the CSV into a list of row dicts, then apply the optional per-row
+    ``annotate`` step (e.g. labeling).
+    Parsed rows (before ``annotate``, so labels always follow the current rules)
+    are pickled next to the CSV as ``<path>.pkl`` so later restarts skip parsing.
+    """
+    rows = _read_rows(path)
+    if annotate is not None:
+        for r in rows:
+            annotate(r)
+    return _intern_labels(rows)
+
+
+def _read_rows(path: str) -> list[dict]:
+    """Parsed rows from the ``<path>.pkl`` cache, or from the CSV (refreshing the cache)."""
+    key = _cache_key(path)
+    cache_path = path + ".pkl"
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, rows = pickle.load(f)
+        if cached_key == key:
+            return rows
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass  # missing or unreadable cache – fall back to parsing
+
     rows: list[dict] = []
     with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+        # column positions resolved once; absent columns are appended as defaults
+        missing = [name for name in _COLUMNS if name not in header]
+        idx = {name: header.index(name) for name in _COLUMNS if name in header}
+        idx.update({name: width + k for k, name in enumerate(missing)})
+        fill = [_COLUMNS[name] for name in missing]
+        ia, it, ir, id_, is_, il = (idx[name] for name in _COLUMNS)
+
         for row in reader:
+            if not row:
+                continue  # blank line
+            if len(row) != width:
+                row = (row + [None] * width)[:width]  # short rows pad with None, like DictReader
+            if fill:
+                row += fill
+            text = (row[it] or "").strip()  # normalized once; downstream reads it as-is
             rows.append(
                 {
-                    "Author": row.get("Author", "Anonymous"),
-                    "Review Text": row.get("Review Text", ""),
-                    "Review Rating": int(row.get("Review Rating", "0") or 0),
-                    "Date": row.get("Date", ""),
-                    "YearMonth": parse_date(row.get("Date", "")),
-                    "State": row.get("State", "Unknown"),
-                    "Label": row.get("Label", ""),  # may be empty; analyzer will fill
+                    "Author": row[ia],
+                    "Review Text": text,
+                    "Snippet": (text[:SNIPPET_LEN] + "…") if len(text) > SNIPPET_LEN else text,
+                    "Review Rating": int(row[ir] or 0),
+                    "Date": row[id_],
+                    "YearMonth": parse_date(row[id_] or ""),
+                    "State": row[is_],
+                    "Label": row[il],  # may be empty; analyzer will fill
                 }
             )
+
+    try:
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((key, rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)  # readers never see a half-written cache
+    except OSError:
+        pass  # read-only data dir: just skip caching
     return rows
 
 
-# upload dataset function here
\ No newline at end of file
+# upload dataset function here
@@ -1,39 +1,25 @@
 """Aggregation helpers for dashboard cards and trend chart.
 Shows: loops, conditionals, dictionaries/lists, small lambdas.
 """
-from collections import defaultdict
-from statistics import mean
 from sentiment_engine import analyze_review
 
+# month name lookup dictionary
+MONTH_NAMES = {
+    '01': 'Jan', '02': 'Feb', '03': 'Mar', '04': 'Apr',
+    '05': 'May', '06': 'Jun', '07': 'Jul', '08': 'Aug',
+    '09': 'Sep', '10': 'Oct', '11': 'Nov', '12': 'Dec'
+}
 
-def _filter_rows(rows: list[dict], *, year_filter: str, state_filter: str) -> list[dict]:
-    def keep(r: dict) -> bool:
-        ok_year = (year_filter == "All" or r.get("YearMonth", "").startswith(str(year_filter)))
-        ok_state = (state_filter in ("All States", "All") or r.get("State") == state_filter)
-        return ok_year and ok_state
+# per-month buckets are [positive, neutral, negative, other] count lists
+POS, NEU, NEG, OTHER = range(4)
+LBL_IDX = {"positive": POS, "neutral": NEU, "negative": NEG}
 
-    return [r for r in rows if keep(r)]
+Buckets = dict[str, list[int]]
 
-def monthly_card_metrics(rows: list[dict], *, year_filter: str, state_filter: str) -> dict:
-    """Return current-month metrics and deltas vs the previous month.
-    - total_reviews: count for latest month
-    - total_delta_pct: % change in total count vs previous month
-    - pos_pct/neg_pct: % of reviews in latest month
-    - pos_delta/neg_delta: percentage-point change vs previous month
-    """
-    filt = _filter_rows(rows, year_filter=year_filter, state_filter=state_filter)
-    # bucket by YearMonth
-    buckets: dict[str, dict[str, int]] = defaultdict(lambda: {"positive": 0, "neutral": 0, "negative": 0})
-
-    for r in filt:
-        ym = r.get("YearMonth", "")
-        if not ym.startswith(str(year_filter)):
-            continue
-        label = r.get("Label") or analyze_review(r.get("Review Text", ""))[0]
-        buckets[ym][label] += 1
 
-    total = len(filt)
-    months = sorted(buckets.keys())
+def _card_metrics(buckets: Buckets, total: int, rating_sum: float) -> dict:
+    """Build the card dict from per-month label counts of the filtered rows."""
+    months = sorted(buckets)
     if not months:
         return {
             "total_reviews": 0, "total_delta_pct": 0.0,
@@ -48,16 +34,16 @@ def monthly_card_metrics(rows: list[dict], *, year_filter: str, state_filter: st
     def pct(count, total): return (100.0 * count / total) if total else 0.0
 
     c_counts = buckets[curr_m]
-    c_total = sum(c_counts.values())
-    c_pos_pct = pct(c_counts["positive"], c_total)
-    c_neg_pct = pct(c_counts["negative"], c_total)
+    c_total = sum(c_counts)
+    c_pos_pct = pct(c_counts[POS], c_total)
+    c_neg_pct = pct(c_counts[NEG], c_total)
 
     # previous month stats
     if prev_m:
         p_counts = buckets[prev_m]
-        p_total = sum(p_counts.values())
-        p_pos_pct = pct(p_counts["positive"], p_total)
-        p_neg_pct = pct(p_counts["negative"], p_total)
+        p_total = sum(p_counts)
+        p_pos_pct = pct(p_counts[POS], p_total)
+        p_neg_pct = pct(p_counts[NEG], p_total)
         total_delta_pct = ((c_total - p_total) / p_total * 100.0) if p_total else 0.0
         pos_delta = c_pos_pct - p_pos_pct  # percentage points
         neg_delta = c_neg_pct - p_neg_pct  # percentage points
@@ -74,43 +60,82 @@ def monthly_card_metrics(rows: list[dict], *, year_filter: str, state_filter: st
         "neg_pct": round(c_neg_pct, 1),
         "neg_delta": round(neg_delta, 1),
         # keep avg_rating simple: average across filtered rows (whole year)
-        "avg_rating": round(mean([r.get("Review Rating", 0) for r in filt]) if filt else 0.0, 1),
+        "avg_rating": round(rating_sum / total if total else 0.0, 1),
     }
 
 
-def monthly_sentiment_trend(rows: list[dict], year: str) -> list[dict]:
-    
-    # month name lookup dictionary
-    month_lookup = {
-        '01': 'Jan', '02': 'Feb', '03': 'Mar', '04': 'Apr',
-        '05': 'May', '06': 'Jun', '07': 'Jul', '08': 'Aug',
-        '09': 'Sep', '10': 'Oct', '11': 'Nov', '12': 'Dec'
-    }
-    
-    # group by YearMonth then compute pos/neu/neg counts
-    buckets: dict[str, dict[str, int]] = defaultdict(lambda: {"positive": 0, "neutral": 0, "negative": 0})
-
-    for r in rows:
-        if not r.get("YearMonth", "").startswith(str(year)):
-            continue
-        label = r.get("Label") or analyze_review(r.get("Review Text", ""))[0]
-        ym = r.get("YearMonth")
-        buckets[ym][label] += 1
-
-    # return chronologically sorted list of monthly percentages
-    months = sorted(buckets.keys())
+def _trend(buckets: Buckets) -> list[dict]:
+    """Chronologically sorted monthly percentages from per-month label counts."""
     trend = []
-    for m in months:
+    for m in sorted(buckets):
         counts = buckets[m]
-        total = sum(counts.values()) or 1
+        total = sum(counts) or 1
         trend.append(
             {
                 "month": m,
-                "month_name": month_lookup[m[-2:]],  # lookup in dictionary to get month name
-                "pos": round(100 * counts["positive"] / total, 1),
-                "neu": round(100 * counts["neutral"] / total, 1),
-                "neg": round(100 * counts["negative"] / total, 1),
+                "month_name": MONTH_NAMES[m[-2:]],  # lookup in dictionary to get month name
+                "pos": round(100 * counts[POS] / total, 1),
+                "neu": round(100 * counts[NEU] / total, 1),
+                "neg": round(100 * counts[NEG] / total, 1),
             }
         )
+    return trend
+
+
+def compute_month_stats(rows: list[dict], *, year_filter: str, state_filter: str) -> tuple[dict, list[dict]]:
+    """Return (cards, trend) from a single pass over rows.
+    cards: see monthly_card_metrics (year + state filter).
+    trend: see monthly_sentiment_trend (year filter only, all states).
+    """
+    prefix = str(year_filter)
+    all_year = year_filter == "All"
+    all_state = state_filter in ("All States", "All")
+
+    trend_buckets: Buckets = {}  # all states
+    card_buckets: Buckets = {}   # restricted to state_filter
+    n_filtered, rating_sum = 0, 0  # running mean, no list of ratings
+    for r in rows:
+        ym = r.get("YearMonth", "")
+        in_year = ym.startswith(prefix)
+        if not (in_year or all_year):
+            continue
+        in_state = all_state or r.get("State") == state_filter
+        if in_state:
+            n_filtered += 1
+            rating_sum += r.get("Review Rating", 0)
+        # rows passed the year test above; with "All" the card months span
+        # years, so only skip rows whose date could not be parsed
+        to_card = in_state and (in_year or ym[:4].isdigit())
+        if in_year or to_card:
+            label = r.get("Label") or analyze_review(r.get("Review Text", ""))[0]
+            idx = LBL_IDX.get(label, OTHER)  # unknown labels still count toward totals
+            if in_year:
+                counts = trend_buckets.get(ym)
+                if counts is None:
+                    counts = trend_buckets[ym] = [0, 0, 0, 0]
+                counts[idx] += 1
+            if to_card:
+                counts = card_buckets.get(ym)
+                if counts is None:
+                    counts = card_buckets[ym] = [0, 0, 0, 0]
+                counts[idx] += 1
+
+    return _card_metrics(card_buckets, n_filtered, rating_sum), _trend(trend_buckets)
+
+
+def monthly_card_metrics(rows: list[dict], *, year_filter: str, state_filter: str) -> dict:
+    """Return current-month metrics and deltas vs the previous month.
+    - total_reviews: count for latest month
+    - total_delta_pct: % change in total count vs previous month
+    - pos_pct/neg_pct: % of reviews in latest month
+    - pos_delta/neg_delta: percentage-point change vs previous month
+    With year_filter "All" the latest/previous months are taken across all years.
+    """
+    return compute_month_stats(rows, year_filter=year_filter, state_filter=state_filter)[0]
+
+
+def monthly_sentiment_trend(rows: list[dict], year: str) -> list[dict]:
+    """Monthly pos/neu/neg percentages for the given year (all states)."""
+    trend = compute_month_stats(rows, year_filter=year, state_filter="All")[1]
     print(trend)
-    return trend
\ No newline at end of file
+    return trend
@@ -0,0 +1,37 @@
+"""Small on-disk cache of corpus sentiment results (pickle), so restarts skip re-scoring.
+Keys are stable digests of review text; the whole file is dropped when the
+analyzer's rules version changes.
+"""
+import hashlib
+import os
+import pickle
+
+# next to this module, not the current working directory
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "sentiment.pkl")
+
+
+def review_key(text: str) -> bytes:
+    """Stable key for a review (built-in hash() is randomized per process)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def load_cache(version: str, path: str = CACHE_PATH) -> dict:
+    """Return the cached {key: (label, score)} dict, or {} if missing/stale."""
+    try:
+        with open(path, "rb") as f:
+            cached_version, results = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return {}
+    return results if cached_version == version else {}
+
+
+def save_cache(d: dict, version: str, path: str = CACHE_PATH) -> None:
+    """Write the results dict; failures (e.g. read-only dir) are ignored."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((version, d), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)  # never leave a half-written cache behind
+    except OSError:
+        pass
@@ -7,33 +7,56 @@ Shows: strings, lists, dicts, functions, control flow, docstrings.
 # - Functions, default args, docstrings, modules (Lec 4 & 5).
 # - Lambda for a small mapping convenience (Lec 6).
 
+import atexit
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional
+
+from sentiment_cache import load_cache, review_key, save_cache
 from tiny_lexicon import POLARITY
 
-NEGATORS = {"not", "no", "never", "n't"}
+NEGATORS = frozenset({"not", "no", "never", "n't"})
 INTENSIFIERS = {"very": 1.25, "really": 1.2, "extremely": 1.5, "too": 1.15}
 DEINTENSIFIERS = {"slightly": 0.8, "somewhat": 0.9, "barely": 0.7}
 PUNCT_BOOST = {"!": 1.1, "?": 1.05}
 
+# [^\W_] is an alphanumeric char (same set as str.isalnum)
+_TOKEN_RE = re.compile(r"[^\W_](?:\S*[^\W_])?")
+
+
+def _build_modifiers() -> dict[str, tuple[str, float]]:
+    return {
+        **{w: ("neg", 0.0) for w in NEGATORS},
+        **{w: ("scale", v) for w, v in INTENSIFIERS.items()},
+        **{w: ("scale", v) for w, v in DEINTENSIFIERS.items()},
+    }
+
+
+# one lookup per token instead of three: word -> ("neg", 0.0) | ("scale", factor)
+MODIFIERS: dict[str, tuple[str, float]] = _build_modifiers()
+
+# a review with none of these words always scores exactly 0.0
+_POLARITY_WORDS = frozenset(POLARITY)
+
+# every known token -> (kind, value); modifiers win over lexicon words
+_WORD = ("word", 0.0)  # default for tokens outside the lexicon
+_TOKEN_TABLE: dict[str, tuple[str, float]] = {
+    **{w: ("word", v) for w, v in POLARITY.items()},
+    **MODIFIERS,
+}
+
 
 def simple_tokenize(text: str) -> list[str]:
     """Very small tokenizer: lower, split on spaces, strip punctuation at ends.
     Intentionally basic to align with Programming Fundamentals.
+    One regex pass: each match runs from the first to the last alphanumeric
+    character of a whitespace-separated word.
     """
-    raw = text.lower().split()
-    tokens: list[str] = []
-    for w in raw:
-        # strip common punctuation from ends only
-        start, end = 0, len(w)
-        while start < end and not w[start].isalnum():
-            start += 1
-        while end > start and not w[end - 1].isalnum():
-            end -= 1
-        core = w[start:end]
-        if core:
-            tokens.append(core)
-    return tokens
+    return _TOKEN_RE.findall(text.lower())
 
 
+@lru_cache(maxsize=4096)  # bounded: also serves free text from POST /analyze
 def analyze_review(text: str) -> tuple[str, float]:
     """Return (label, score) where label∈{positive, neutral, negative}.
 
@@ -43,39 +66,55 @@ def analyze_review(text: str) -> tuple[str, float]:
     * Intensifiers scale the following word.
     * De‑intensifiers shrink the following word.
     * Ending punctuation can slightly boost magnitude.
+
+    Results are memoized in memory; texts already scored by
+    analyze_corpus_review are served from the on-disk cache (see sentiment_cache).
+    Call clear_caches() after editing the rule tables (see its docstring for scope).
     """
+    result = _DISK_CACHE.get(review_key(text))
+    return result if result is not None else _score_review(text)
+
+
+def analyze_corpus_review(text: str) -> tuple[str, float]:
+    """analyze_review for dataset rows: the result is also persisted to the
+    on-disk cache. Only use it for corpus texts, never for arbitrary user input.
+    """
+    key = review_key(text)
+    result = _DISK_CACHE.get(key)
+    if result is None:
+        result = _DISK_CACHE[key] = analyze_review(text)
+    return result
+
+
+def _score_review(text: str) -> tuple[str, float]:
+    """Uncached scorer behind analyze_review."""
     tokens = simple_tokenize(text)
+    if _POLARITY_WORDS.isdisjoint(tokens):
+        return "neutral", 0.0  # no lexicon hits: modifiers/punctuation can't add anything
     total = 0.0
     negate_next = False
     scale = 1.0
-
-    for i, t in enumerate(tokens):
-        # control flow with if/elif – fundamentals
-        if t in NEGATORS:
+    # bind the table to a local once (LOAD_FAST instead of LOAD_GLOBAL per token)
+    token_get, plain = _TOKEN_TABLE.get, _WORD
+
+    for t in tokens:
+        # one dict lookup per token, then branch on its kind (most common first)
+        kind, val = token_get(t, plain)
+        if kind == "word":
+            if negate_next:
+                val = -val
+                negate_next = False
+
+            total += val * scale
+            # decay scale gradually so multiple intensifiers don’t explode
+            scale = 1.0 + (scale - 1.0) * 0.5
+        elif kind == "neg":
             negate_next = True
-            continue
-        if t in INTENSIFIERS:
-            scale *= INTENSIFIERS[t]
-            continue
-        if t in DEINTENSIFIERS:
-            scale *= DEINTENSIFIERS[t]
-            continue
-
-        # lexicon lookup (dict)
-        val = POLARITY.get(t, 0.0)
-        if negate_next:
-            val = -val
-            negate_next = False
-
-        total += val * scale
-        # decay scale gradually so multiple intensifiers don’t explode
-        scale = 1.0 + (scale - 1.0) * 0.5
-
-    # punctuation boost (very small)
-    if text.endswith("!"):
-        total *= PUNCT_BOOST["!"]
-    elif text.endswith("?"):
-        total *= PUNCT_BOOST["?"]
+        else:  # intensifier / de-intensifier
+            scale *= val
+
+    # punctuation boost (very small); text[-1:] is "" for empty text
+    total *= PUNCT_BOOST.get(text[-1:], 1.0)
 
     # map to label with simple thresholds
     label = "neutral"
@@ -87,5 +126,58 @@ def analyze_review(text: str) -> tuple[str, float]:
     return label, round(total, 3)
 
 
+# any change to the rules/lexicon yields a new version and a fresh disk cache;
+# bump _SCORER_VERSION when the scoring code itself changes
+_SCORER_VERSION = 1
+
+
+def _rules_version() -> str:
+    return repr((_SCORER_VERSION, sorted(POLARITY.items()), sorted(MODIFIERS.items()), sorted(PUNCT_BOOST.items())))
+
+
+_RULES_VERSION = _rules_version()
+_DISK_CACHE = load_cache(_RULES_VERSION)
+_DISK_CACHE_START = len(_DISK_CACHE)
+
+
+@atexit.register
+def _flush_disk_cache() -> None:
+    if len(_DISK_CACHE) != _DISK_CACHE_START:  # only write when something new was scored
+        save_cache(_DISK_CACHE, _RULES_VERSION)
+
+
+def clear_caches() -> None:
+    """Resync the analyzer after editing POLARITY, NEGATORS, INTENSIFIERS,
+    DEINTENSIFIERS or PUNCT_BOOST at runtime: rebuilds MODIFIERS and the token
+    tables, empties analyze_review's memo and the persisted corpus results.
+    Labels already attached to loaded rows (app REVIEWS, its dashboard
+    snapshots) are not touched; reload the app data to relabel them.
+    """
+    global _POLARITY_WORDS, _RULES_VERSION
+    analyze_review.cache_clear()
+    MODIFIERS.clear()
+    MODIFIERS.update(_build_modifiers())
+    _POLARITY_WORDS = frozenset(POLARITY)
+    _TOKEN_TABLE.clear()
+    _TOKEN_TABLE.update({w: ("word", v) for w, v in POLARITY.items()})
+    _TOKEN_TABLE.update(MODIFIERS)
+    _RULES_VERSION = _rules_version()
+    _DISK_CACHE.clear()
+
+
+def analyze_many(texts, workers: Optional[int] = None, chunksize: int = 1024) -> list[tuple[str, float]]:
+    """analyze_corpus_review over a corpus, scoring not-yet-cached texts in worker processes.
+    Workers only run the pure scorer; results are stored in the caches here,
+    so worker processes never write the on-disk cache themselves.
+    """
+    texts = list(texts)
+    todo = list({t: None for t in texts if review_key(t) not in _DISK_CACHE})  # unique, in order
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for t, result in zip(todo, ex.map(_score_review, todo, chunksize=chunksize)):
+                _DISK_CACHE[review_key(t)] = result
+    return [analyze_corpus_review(t) for t in texts]
+
+
 def label_to_color(label: str) -> str:
     return {"positive": "#22c55e", "neutral": "#f59e0b", "negative": "#ef4444"}.get(label, "#6b7280")